@@ -6,18 +6,52 @@ Computes deterministic hashes and structured deltas for AI analysis.
 """
 
 import hashlib
-import json
 from datetime import datetime
-from decimal import Decimal
 from typing import Optional
 
+# Shared string constants for the per-row fields of a delta
+_UNKNOWN = "Unknown"
+_CLAIMED = "claimed"
+_ADDED = "added"
 
-class DecimalEncoder(json.JSONEncoder):
-    """JSON encoder that handles Decimal types."""
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return str(obj)
-        return super().default(obj)
+
+# game_id -> (fingerprint, sub-hash). Most games are unchanged between
+# runs, so their sub-hash is reused instead of being recomputed.
+_GAME_HASH_CACHE: dict[str, tuple[tuple, bytes]] = {}
+
+
+def _game_fingerprint(game: dict) -> tuple:
+    """
+    The game's DNA as (status, ((value, total, odds), ...)).
+    
+    Built fresh on every call and never stored on the game dict: registries
+    are updated in place (the notary does), so a memo on the entry would go
+    stale, and it would leak into the serialized registry.
+    """
+    return (
+        game.get("status"),
+        tuple((p.get("value"), p.get("total"), p.get("odds")) for p in game.get("prizes", [])),
+    )
+
+
+def _game_sub_hash(game_id: str, game: dict) -> bytes:
+    """Hash a single game's DNA, reusing the cached digest when it is unchanged."""
+    fp = _game_fingerprint(game)
+    
+    cached = _GAME_HASH_CACHE.get(game_id)
+    if cached is not None and cached[0] == fp:
+        return cached[1]
+    
+    status, prizes = fp
+    h = hashlib.blake2b(digest_size=8)
+    h.update(f"{game_id}|{status}|".encode())
+    for value, total, odds in prizes:
+        # Decimal values stringify to the same text they are stored as
+        h.update(f"{value}|{total}|{odds};".encode())
+    sub_hash = h.digest()
+    
+    _GAME_HASH_CACHE[game_id] = (fp, sub_hash)
+    return sub_hash
 
 
 def compute_data_hash(registry: dict) -> str:
@@ -26,20 +60,16 @@ def compute_data_hash(registry: dict) -> str:
     
     Ignores volatile fields (timestamps, run_ids) to detect actual data changes.
     Only hashes the "DNA" of the data: game_id, prizes, status.
+    
+    Each game contributes a cached sub-hash; the sub-hashes are folded in
+    sorted game_id order, so only games whose DNA changed are rehashed.
     """
-    # Extract only the fields that represent actual data changes
-    hashable_data = {}
+    h = hashlib.blake2b(digest_size=8)
     
-    for game_id, game in registry.items():
-        hashable_data[game_id] = {
-            "game_id": game.get("game_id"),
-            "status": game.get("status"),
-            "prizes": game.get("prizes", [])
-        }
+    for game_id, game in sorted(registry.items()):
+        h.update(_game_sub_hash(game_id, game))
     
-    # Sort keys for deterministic ordering
-    serialized = json.dumps(hashable_data, sort_keys=True, cls=DecimalEncoder)
-    return hashlib.sha256(serialized.encode()).hexdigest()[:16]
+    return h.hexdigest()
 
 
 def compute_delta(old_registry: dict, new_registry: dict, run_id: str) -> dict:
@@ -63,42 +93,38 @@ def compute_delta(old_registry: dict, new_registry: dict, run_id: str) -> dict:
         "summary": ""
     }
     
-    old_ids = set(old_registry.keys())
-    new_ids = set(new_registry.keys())
-    
-    # New games
-    for game_id in (new_ids - old_ids):
-        game = new_registry[game_id]
-        delta["games_added"].append({
-            "game_id": game_id,
-            "game_name": game.get("game_name", "Unknown"),
-            "ticket_price": game.get("ticket_price", "Unknown")
-        })
-    
-    # Retired games
-    for game_id in (old_ids - new_ids):
-        game = old_registry[game_id]
-        delta["games_retired"].append({
-            "game_id": game_id,
-            "game_name": game.get("game_name", "Unknown")
-        })
-    
-    # Check for status changes (ACTIVE -> RETIRED)
-    for game_id in (old_ids & new_ids):
-        old_status = old_registry[game_id].get("status")
-        new_status = new_registry[game_id].get("status")
+    # One pass over the new registry handles added and common games
+    for game_id, new_game in new_registry.items():
+        old_game = old_registry.get(game_id)
+        
+        # New games
+        if old_game is None:
+            delta["games_added"].append({
+                "game_id": game_id,
+                "game_name": new_game.get("game_name", _UNKNOWN),
+                "ticket_price": new_game.get("ticket_price", _UNKNOWN)
+            })
+            continue
+        
+        # Most games are untouched between runs; skip them before any per-prize work
+        if _game_fingerprint(old_game) == _game_fingerprint(new_game):
+            continue
+        
+        old_status = old_game.get("status")
+        new_status = new_game.get("status")
+        old_prizes = old_game.get("prizes", [])
+        new_prizes = new_game.get("prizes", [])
+        game_name = new_game.get("game_name", _UNKNOWN)
+        
+        # Check for status changes (ACTIVE -> RETIRED)
         if old_status != new_status:
             delta["games_retired"].append({
                 "game_id": game_id,
-                "game_name": new_registry[game_id].get("game_name", "Unknown"),
+                "game_name": game_name,
                 "reason": f"Status changed: {old_status} -> {new_status}"
             })
-    
-    # Prize changes (the interesting stuff for AI)
-    for game_id in (old_ids & new_ids):
-        old_prizes = old_registry[game_id].get("prizes", [])
-        new_prizes = new_registry[game_id].get("prizes", [])
         
+        # Prize changes (the interesting stuff for AI)
         # Compare prize totals at each tier
         for i, (old_p, new_p) in enumerate(zip(old_prizes, new_prizes)):
             old_total = int(old_p.get("total", 0))
@@ -110,15 +136,22 @@ def compute_delta(old_registry: dict, new_registry: dict, run_id: str) -> dict:
                 
                 delta["prize_changes"].append({
                     "game_id": game_id,
-                    "game_name": new_registry[game_id].get("game_name", "Unknown"),
+                    "game_name": game_name,
                     "prize_tier": i,
                     "prize_value": str(prize_value),
                     "old_remaining": old_total,
                     "new_remaining": new_total,
                     "change": change,
-                    "meaning": f"{abs(change)} {'claimed' if change < 0 else 'added'}"
+                    "meaning": f"{abs(change)} {_CLAIMED if change < 0 else _ADDED}"
                 })
     
+    # Retired games (gone from the new registry entirely)
+    for game_id in old_registry.keys() - new_registry.keys():
+        delta["games_retired"].append({
+            "game_id": game_id,
+            "game_name": old_registry[game_id].get("game_name", _UNKNOWN)
+        })
+    
     # Calculate wealth delta
     delta["wealth_before"] = _calculate_total_wealth(old_registry)
     delta["wealth_after"] = _calculate_total_wealth(new_registry)
@@ -130,15 +163,20 @@ def compute_delta(old_registry: dict, new_registry: dict, run_id: str) -> dict:
     return delta
 
 
+def _as_int(raw) -> int:
+    """Parse a stored number, skipping string cleanup for values that are already ints."""
+    if type(raw) is int:
+        return raw
+    return int(str(raw).replace(",", ""))
+
+
 def _calculate_total_wealth(registry: dict) -> int:
     """Calculate total remaining prize money across all games."""
     total = 0
     for game in registry.values():
         for prize in game.get("prizes", []):
             try:
-                value = int(str(prize.get("value", 0)).replace(",", ""))
-                count = int(str(prize.get("total", 0)).replace(",", ""))
-                total += value * count
+                total += _as_int(prize.get("value", 0)) * _as_int(prize.get("total", 0))
             except (ValueError, TypeError):
                 continue
     return total
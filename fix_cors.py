@@ -8,21 +8,24 @@ def load_env():
     """Manually load .env file"""
     if os.path.exists(ENV_FILE):
         print(f"📄 Loading {ENV_FILE}...")
+        parsed = {}
         with open(ENV_FILE, "r") as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith("#"):
-                    continue
+            # .env is tiny: one read, then split in memory
+            lines = f.read().splitlines()
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            
+            # Handle 'export ' prefix
+            if line.lower().startswith("export "):
+                line = line[7:].strip()
                 
-                # Handle 'export ' prefix
-                if line.lower().startswith("export "):
-                    line = line[7:].strip()
-                    
-                if "=" in line:
-                    key, val = line.split("=", 1)
-                    key = key.strip()
-                    val = val.strip().strip('"').strip("'")
-                    os.environ[key] = val
+            key, sep, val = line.partition("=")
+            if sep:
+                parsed[key.strip()] = val.strip().strip('"').strip("'")
+        # One batched environ update instead of a putenv per line
+        os.environ.update(parsed)
     else:
         print(f"⚠️ {ENV_FILE} not found!")
 
@@ -1,32 +1,45 @@
 import logging
-import json
-from datetime import datetime
+import orjson
+from datetime import datetime, timezone
 import sys
 
+# Extra fields copied from the log record when present
+EXTRA_FIELDS = ("run_id", "game_count", "duration_ms", "html_size_kb")
+_MISSING = object()
+
 class JSONFormatter(logging.Formatter):
     """
     Structured JSON formatter for machine-readable logs.
     Makes debugging and monitoring 10x easier.
     """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (epoch second, formatted "YYYY-MM-DDTHH:MM:SS") - re-rendered once per second
+        self._ts_cache = (None, "")
+
+    def _timestamp(self, created):
+        sec = int(created)
+        cached_sec, prefix = self._ts_cache
+        if sec != cached_sec:
+            prefix = datetime.fromtimestamp(sec, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+            self._ts_cache = (sec, prefix)
+        return f"{prefix}.{int((created - sec) * 1_000_000):06d}Z"
+
     def format(self, record):
         log_data = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": self._timestamp(record.created),
             "level": record.levelname,
             "module": record.module,
             "message": record.getMessage(),
         }
         
         # Add extra fields if present
-        if hasattr(record, 'run_id'):
-            log_data['run_id'] = record.run_id
-        if hasattr(record, 'game_count'):
-            log_data['game_count'] = record.game_count
-        if hasattr(record, 'duration_ms'):
-            log_data['duration_ms'] = record.duration_ms
-        if hasattr(record, 'html_size_kb'):
-            log_data['html_size_kb'] = record.html_size_kb
+        for attr in EXTRA_FIELDS:
+            value = getattr(record, attr, _MISSING)
+            if value is not _MISSING:
+                log_data[attr] = value
             
-        return json.dumps(log_data)
+        return orjson.dumps(log_data).decode()
 
 def setup_logger(name):
     """
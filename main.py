@@ -1,18 +1,16 @@
 import os
+import shutil
 import sys
 import time
 from opentelemetry import trace
-from sensor_nc import capture_session, fetch_game_dna
-from notary import process_audit
+from sensor_nc import capture_session
+from notary import process_audit, REGISTRY_FILE
 from vault import upload_to_vault
 from logger import setup_logger
 from metrics import export_metrics
 
 logger = setup_logger(__name__)
 
-# Configuration
-DEEP_DIVE_LIMIT = 5
-
 def start_librarian():
     """
     The Conductor. Orchestrates the Sensor, Notary, and Vault.
@@ -54,11 +52,14 @@ def start_librarian():
         # or can be implemented as a separate scheduled maintenance pass
         
         # 3. Room 3: The Vault
-        # Create a temporary copy of registry.json with the run_id for the archive
-        import json
+        # Create a temporary copy of registry.json with the run_id for the archive.
+        # The Notary has already serialized this exact registry, so hard-link its
+        # file (falling back to a byte copy) instead of encoding the JSON again.
         archive_registry = f"registry_{run_id}.json"
-        with open(archive_registry, 'w') as f:
-            json.dump(registry, f, indent=2)
+        try:
+            os.link(REGISTRY_FILE, archive_registry)
+        except OSError:
+            shutil.copyfile(REGISTRY_FILE, archive_registry)
             
         sync_success = upload_to_vault(
             run_id=run_id,
@@ -67,7 +68,8 @@ def start_librarian():
             registry_path=archive_registry
         )
         
-        # Cleanup the temporary archive file
+        # Cleanup the temporary archive file; the Vault has already uploaded it
+        os.remove(archive_registry)
         
         duration_ms = int((time.time() - start_time) * 1000)
         
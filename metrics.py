@@ -3,14 +3,18 @@
 
 import json
 import os
+from collections import deque
 from datetime import datetime
 from typing import Dict, Any
 
-METRICS_FILE = "metrics.json"
+# Newline-delimited JSON: one entry per line, so a run only appends
+METRICS_FILE = "metrics.jsonl"
+METRICS_WINDOW = 200  # Keep last 200 entries (approx 50 days at 4x/day)
+TRIM_SLACK = 50  # Only rewrite the file once it grows this far past the window
 
 def export_metrics(run_id: str, metrics: Dict[str, Any]):
     """
-    Export metrics to JSON file for consumption by monitoring tools.
+    Export metrics to JSONL file for consumption by monitoring tools.
     
     Args:
         run_id: Unique run identifier
@@ -22,23 +26,29 @@ def export_metrics(run_id: str, metrics: Dict[str, Any]):
         **metrics
     }
     
-    # Append to metrics file (create if doesn feed exists)
-    existing_metrics = []
-    if os.path.exists(METRICS_FILE):
-        with open(METRICS_FILE, 'r') as f:
-            try:
-                existing_metrics = json.load(f)
-            except json.JSONDecodeError:
-                existing_metrics = []
+    # Append to metrics file (created if it doesn't exist)
+    line = json.dumps(metric_entry) + "\n"
+    with open(METRICS_FILE, 'a') as f:
+        f.write(line)
     
-    existing_metrics.append(metric_entry)
-    
-    # Keep last 200 entries (approx 50 days at 4x/day)
-    if len(existing_metrics) > 200:
-        existing_metrics = existing_metrics[-200:]
+    # Entries are near-uniform in size, so the file size tells roughly how
+    # many lines it holds without reading it; trim only once well past the window
+    if os.path.getsize(METRICS_FILE) > len(line) * (METRICS_WINDOW + TRIM_SLACK):
+        _trim_metrics()
+
+
+def _trim_metrics():
+    """Cut the file back to the last METRICS_WINDOW entries."""
+    with open(METRICS_FILE, 'rb') as f:
+        tail = deque(f, maxlen=METRICS_WINDOW)
     
-    with open(METRICS_FILE, 'w') as f:
-        json.dump(existing_metrics, f, indent=2)
+    # Written to a temp file first, so a crash mid-trim keeps the old history
+    tmp_file = METRICS_FILE + ".tmp"
+    with open(tmp_file, 'wb') as f:
+        f.writelines(tail)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, METRICS_FILE)
 
 
 def get_latest_metrics(count: int = 10) -> list:
@@ -47,8 +57,10 @@ def get_latest_metrics(count: int = 10) -> list:
         return []
     
     with open(METRICS_FILE, 'r') as f:
-        try:
-            metrics = json.load(f)
-            return metrics[-count:]
-        except json.JSONDecodeError:
-            return []
+        # Only the tail lines are kept and parsed
+        lines = deque(f, maxlen=count)
+    
+    try:
+        return [json.loads(line) for line in lines if line.strip()]
+    except json.JSONDecodeError:
+        return []
@@ -5,12 +5,17 @@ Pydantic models that validate ALL lottery data at the extraction boundary.
 If any number is malformed, the run ABORTS before bad data enters the registry.
 """
 
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError, field_validator, model_validator
 from decimal import Decimal, InvalidOperation
 from typing import Optional
 import re
 
 
+# str.translate strips every unwanted character in one C-level pass
+_CURRENCY_STRIP = str.maketrans("", "", "$,")
+_COMMA_STRIP = str.maketrans("", "", ",")
+
+
 class Prize(BaseModel):
     """A single prize row from the lottery website."""
     
@@ -27,34 +32,34 @@ class Prize(BaseModel):
     @classmethod
     def parse_currency(cls, v):
         """Convert '$1,000,000' to Decimal 1000000"""
-        if isinstance(v, (int, float, Decimal)):
-            return Decimal(str(v))
         if isinstance(v, str):
             # Remove $, commas, and whitespace
-            cleaned = v.replace('$', '').replace(',', '').strip()
+            cleaned = v.translate(_CURRENCY_STRIP).strip()
             if not cleaned:
                 raise ValueError(f"Empty currency value: '{v}'")
             try:
                 return Decimal(cleaned)
             except InvalidOperation:
                 raise ValueError(f"Cannot parse currency: '{v}'")
+        if isinstance(v, (int, float, Decimal)):
+            return Decimal(str(v))
         raise ValueError(f"Unexpected type for currency: {type(v)}")
     
     @field_validator('odds', mode='before')
     @classmethod
     def parse_odds(cls, v):
         """Convert '1,469,394' or '1 in 1,469,394' to Decimal"""
-        if isinstance(v, (int, float, Decimal)):
-            return Decimal(str(v))
         if isinstance(v, str):
             # Remove "1 in " prefix if present
-            cleaned = v.replace('1 in ', '').replace(',', '').strip()
+            cleaned = v.replace('1 in ', '').translate(_COMMA_STRIP).strip()
             if not cleaned:
                 raise ValueError(f"Empty odds value: '{v}'")
             try:
                 return Decimal(cleaned)
             except InvalidOperation:
                 raise ValueError(f"Cannot parse odds: '{v}'")
+        if isinstance(v, (int, float, Decimal)):
+            return Decimal(str(v))
         raise ValueError(f"Unexpected type for odds: {type(v)}")
     
     @field_validator('total', mode='before')
@@ -64,7 +69,7 @@ class Prize(BaseModel):
         if isinstance(v, int):
             return v
         if isinstance(v, str):
-            cleaned = v.replace(',', '').strip()
+            cleaned = v.translate(_COMMA_STRIP).strip()
             if not cleaned:
                 raise ValueError(f"Empty total value: '{v}'")
             try:
@@ -107,8 +112,12 @@ class GameRaw(BaseModel):
         return self
     
     def total_remaining_value(self) -> Decimal:
-        """Calculate total prize money remaining for this game."""
-        return sum(p.value * p.total for p in self.prizes)
+        """
+        Total prize money remaining for this game.
+        Computed on each call: prizes can be edited after validation
+        (assignment, append, model_copy), so a stored total would go stale.
+        """
+        return sum((p.value * p.total for p in self.prizes), Decimal(0))
 
 
 class SensorOutput(BaseModel):
@@ -125,37 +134,53 @@ class SensorOutput(BaseModel):
     
     def total_universe_value(self) -> Decimal:
         """Sum of all remaining prize money across all games."""
-        return sum(g.total_remaining_value() for g in self.games)
+        return sum((g.total_remaining_value() for g in self.games), Decimal(0))
 
 
-# Helper function for sensor.py
-def validate_extracted_prize(value: str, odds: str, total: str) -> Prize:
-    """
-    Create and validate a Prize from raw strings.
-    Raises ValidationError if anything is malformed.
-    """
-    return Prize(
-        value=value,
-        odds=odds, 
-        total=total,
-        raw_value=value,
-        raw_odds=odds,
-        raw_total=total
-    )
+def _game_payload(game_id: str, game_name: str, url_slug: str, prizes: list[dict]) -> dict:
+    """Input dict for GameRaw, keeping the original prize strings for the audit trail."""
+    return {
+        "game_id": game_id,
+        "game_name": game_name,
+        "url_slug": url_slug,
+        "prizes": [
+            {
+                "value": p['value'],
+                "odds": p['odds'],
+                "total": p['total'],
+                "raw_value": p['value'],
+                "raw_odds": p['odds'],
+                "raw_total": p['total']
+            }
+            for p in prizes
+        ]
+    }
+
 
+# Validates a whole extraction in one pydantic-core call
+GAMES_ADAPTER = TypeAdapter(list[GameRaw])
 
-def validate_extracted_game(game_id: str, game_name: str, url_slug: str, prizes: list[dict]) -> GameRaw:
+
+def validate_extracted_games(games: list[dict]) -> tuple[list[GameRaw], dict[int, ValidationError]]:
     """
-    Create and validate a GameRaw from extracted data.
-    Raises ValidationError if anything is malformed.
+    Validate every extracted game (dicts with game_id, game_name, url_slug, prizes).
+    
+    Returns the valid games in input order, plus the ValidationError of each
+    rejected game keyed by its index. Only a failing batch falls back to
+    per-game validation, and only for the games it flagged.
     """
-    validated_prizes = [
-        validate_extracted_prize(p['value'], p['odds'], p['total'])
-        for p in prizes
-    ]
-    return GameRaw(
-        game_id=game_id,
-        game_name=game_name,
-        url_slug=url_slug,
-        prizes=validated_prizes
-    )
+    payloads = [_game_payload(g['game_id'], g['game_name'], g['url_slug'], g['prizes']) for g in games]
+    try:
+        return GAMES_ADAPTER.validate_python(payloads), {}
+    except ValidationError as batch_error:
+        flagged = {err['loc'][0] for err in batch_error.errors() if err['loc']}
+    
+    failures = {}
+    for i in sorted(flagged):
+        try:
+            GameRaw.model_validate(payloads[i])
+        except ValidationError as ve:
+            failures[i] = ve
+    
+    valid = [payload for i, payload in enumerate(payloads) if i not in failures]
+    return GAMES_ADAPTER.validate_python(valid), failures
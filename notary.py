@@ -1,9 +1,12 @@
-import json
+import functools
+import orjson
 import os
 import uuid
 import re
+from collections import deque
 from datetime import datetime
 from opentelemetry import trace
+from text_utils import NON_DIGITS
 
 tracer = trace.get_tracer(__name__)
 
@@ -11,97 +14,117 @@ REGISTRY_FILE = "registry.json"
 PULSE_FILE = "pulse_history.json"
 PULSE_WINDOW = 200 # ~50 days of memory at 4 runs/day
 
+# Pulse history is loaded from disk once per process
+_PULSE = None
+
+_SLUG_STRIP = re.compile(r'[^\w\s-]')
+_SLUG_JOIN = re.compile(r'[\s_]+')
+
+@functools.lru_cache(maxsize=4096)
 def slugify(text):
+    # Game names repeat run after run, so results are memoized
     text = text.lower()
-    text = re.sub(r'[^\w\s-]', '', text)
-    text = re.sub(r'[\s_]+', '-', text).strip('-')
+    text = _SLUG_STRIP.sub('', text)
+    text = _SLUG_JOIN.sub('-', text).strip('-')
     return text
 
+def _prize_wealth(prize):
+    """
+    Value * remaining count for a single prize row.
+    Raises ValueError/KeyError/TypeError on malformed rows.
+    """
+    # Provider rows carry pre-parsed ints; no string cleanup needed
+    if 'value_int' in prize and 'total_int' in prize:
+        return prize['value_int'] * prize['total_int']
+    
+    # Handle both Pydantic models (Decimal/int) and legacy string data
+    val = prize['value']
+    if isinstance(val, str):
+        val = int(val.translate(NON_DIGITS) or 0)
+    else:
+        val = int(val)  # Convert Decimal to int
+    
+    count = prize['total']
+    if isinstance(count, str):
+        count = int(count)
+    
+    return val * count
+
+def _game_wealth(data):
+    """Remaining prize money for one game, skipping malformed prize rows."""
+    total = 0
+    for prize in data.get("prizes", []):
+        try:
+            total += _prize_wealth(prize)
+        except (ValueError, KeyError, TypeError):
+            continue
+    return total
+
+def _top_prize_wealth(data):
+    """Remaining money in one game's #1 prize tier (0 if unavailable)."""
+    try:
+        # The first prize in the list is usually the top prize
+        return _prize_wealth(data["prizes"][0])
+    except (ValueError, KeyError, IndexError, TypeError):
+        return 0
+
 def calculate_total_wealth(registry):
     """
     Sums up every prize in the registry to calculate the total state wealth.
     Used as an integrity checksum.
     """
-    total = 0
-    for gid, data in registry.items():
-        if data["status"] == "ACTIVE":
-            for prize in data.get("prizes", []):
-                try:
-                    # Handle both Pydantic models (Decimal/int) and legacy string data
-                    val = prize['value']
-                    if isinstance(val, str):
-                        val = int(re.sub(r'[^\d]', '', val))
-                    else:
-                        val = int(val)  # Convert Decimal to int
-                    
-                    count = prize['total']
-                    if isinstance(count, str):
-                        count = int(count)
-                    
-                    total += (val * count)
-                except (ValueError, KeyError, TypeError):
-                    continue
-    return total
+    return sum(_game_wealth(data) for data in registry.values() if data["status"] == "ACTIVE")
 
 def calculate_top_prize_sum(registry):
     """
     Sums up ONLY the value of the remaining #1 top prizes for every game.
     Useful for high-volatility auditing.
     """
-    total = 0
-    for gid, data in registry.items():
-        if data["status"] == "ACTIVE" and data.get("prizes"):
-            try:
-                # The first prize in the list is usually the top prize
-                top_prize = data["prizes"][0]
-                
-                # Handle both Pydantic models (Decimal/int) and legacy string data
-                val = top_prize['value']
-                if isinstance(val, str):
-                    val = int(re.sub(r'[^\d]', '', val))
-                else:
-                    val = int(val)  # Convert Decimal to int
-                
-                count = top_prize['total']
-                if isinstance(count, str):
-                    count = int(count)
-                
-                total += (val * count)
-            except (ValueError, KeyError, IndexError, TypeError):
-                continue
-    return total
+    return sum(_top_prize_wealth(data) for data in registry.values()
+               if data["status"] == "ACTIVE" and data.get("prizes"))
 
-def update_pulse(stats):
+def _active_totals(registry):
     """
-    Maintains a rolling history of the Librarian's vital signs.
+    (total wealth, top prize sum, per-game wealth) over ACTIVE games, filtering
+    the registry once. The totals equal calculate_total_wealth and
+    calculate_top_prize_sum; the per-game wealth (keyed by game id) is kept in
+    memory so a game's old contribution can be taken back out without
+    re-summing its prizes.
     """
-    if os.path.exists(PULSE_FILE):
-        with open(PULSE_FILE, 'r') as f:
-            try:
-                history = json.load(f)
-            except json.JSONDecodeError:
-                history = []
-    else:
+    wealth_by_gid = {gid: _game_wealth(data) for gid, data in registry.items() if data["status"] == "ACTIVE"}
+    top_prizes = sum(_top_prize_wealth(registry[gid]) for gid in wealth_by_gid if registry[gid].get("prizes"))
+    return sum(wealth_by_gid.values()), top_prizes, wealth_by_gid
+
+def _load_pulse():
+    """Loads pulse_history.json into the in-memory window on first use."""
+    global _PULSE
+    if _PULSE is None:
         history = []
+        if os.path.exists(PULSE_FILE):
+            with open(PULSE_FILE, 'rb') as f:
+                try:
+                    history = orjson.loads(f.read())
+                except orjson.JSONDecodeError:
+                    history = []
+        # Keeping the window healthy
+        _PULSE = deque(history, maxlen=PULSE_WINDOW)
+    return _PULSE
 
+def update_pulse(stats):
+    """
+    Maintains a rolling history of the Librarian's vital signs.
+    """
+    history = _load_pulse()
     history.append(stats)
-    # Keeping the window healthy
-    if len(history) > PULSE_WINDOW:
-        history = history[-PULSE_WINDOW:]
-
-    with open(PULSE_FILE, 'w') as f:
-        json.dump(history, f, indent=2)
+    with open(PULSE_FILE, 'wb') as f:
+        f.write(orjson.dumps(list(history), option=orjson.OPT_INDENT_2))
     return history
 
 def get_statistical_baseline():
     """
     Calculates the average wealth and game count from memory.
     """
-    if not os.path.exists(PULSE_FILE):
-        return None
-        
-    with open(PULSE_FILE, 'r') as f:
-        history = json.load(f)
+    history = _load_pulse()
     
     if len(history) < 3: # Need at least a few runs for a baseline
         return None
@@ -129,29 +152,41 @@ def process_audit(parsed_games, run_id, html_size_kb=0):
         now = datetime.now().isoformat()
         
         if os.path.exists(REGISTRY_FILE):
-            with open(REGISTRY_FILE, 'r') as f:
+            with open(REGISTRY_FILE, 'rb') as f:
                 try:
-                    registry = json.load(f)
-                except json.JSONDecodeError:
+                    registry = orjson.loads(f.read())
+                except orjson.JSONDecodeError:
                     registry = {}
         else:
             registry = {}
 
         # --- INTEGRITY CHECKSUM (Improvement 1 & Memory) ---
-        old_wealth = calculate_total_wealth(registry)
+        old_wealth, old_top_prizes, old_wealth_by_gid = _active_totals(registry)
+        # Games that were ACTIVE before this run; only these can miss a census
+        active_gids = old_wealth_by_gid.keys()
         baseline = get_statistical_baseline()
         
-        # Temporarily update registry in memory to check new stats
-        temp_registry = registry.copy()
+        # Single pass over the parsed games: project the new stats incrementally
+        # (every parsed game becomes ACTIVE with its new prizes, so only those
+        # games' contributions change) and stage the registry updates, which are
+        # only applied once the integrity checks pass.
+        # (Last occurrence wins for duplicate game ids.)
+        parsed_by_gid = {g['game_id']: g for g in parsed_games}
+        live_ids = parsed_by_gid.keys()
+        new_wealth = old_wealth
+        new_top_prizes = old_top_prizes
         birth_count = 0
-        for game in parsed_games:
-            gid = game['game_id']
-            if gid not in temp_registry:
+        staged = []
+        for gid, game in parsed_by_gid.items():
+            existing = registry.get(gid)
+            if existing is None:
                 birth_count += 1
-            temp_registry[gid] = {"prizes": game["prizes"], "status": "ACTIVE"}
-
-        new_wealth = calculate_total_wealth(temp_registry)
-        new_top_prizes = calculate_top_prize_sum(temp_registry)
+            elif existing["status"] == "ACTIVE":
+                new_wealth -= old_wealth_by_gid[gid]
+                new_top_prizes -= _top_prize_wealth(existing)
+            new_wealth += _game_wealth(game)
+            new_top_prizes += _top_prize_wealth(game)
+            staged.append((gid, game, existing))
         new_game_count = len(parsed_games)
         
         span.set_attribute("old_wealth", old_wealth)
@@ -174,16 +209,14 @@ def process_audit(parsed_games, run_id, html_size_kb=0):
                 print(f"!!! [Notary] Statistical Anomaly: Wealth differs from {baseline['sample_size']}-run baseline by {wealth_diff*100:.1f}%.")
                 # We don't necessarily abort here, but we log it for the Auditor to be aware
         
-        # Continue with actual update...
-        live_ids = {g['game_id'] for g in parsed_games}
+        # Continue with actual update: commit the staged games
         death_count = 0
-        for game in parsed_games:
-            gid = game['game_id']
+        for gid, game, existing in staged:
             p_slug = slugify(game['game_name'])
             
-            if gid in registry:
+            if existing is not None:
                 # STASIS: Game exists, update its pulse
-                registry[gid].update({
+                existing.update({
                     "last_seen": now,
                     "status": "ACTIVE",
                     "miss_count": 0,
@@ -209,15 +242,15 @@ def process_audit(parsed_games, run_id, html_size_kb=0):
                     "last_run_id": run_id
                 }
 
-        # DEATH Management
-        for gid, data in registry.items():
-            if data["status"] == "ACTIVE" and gid not in live_ids:
-                data["miss_count"] += 1
-                if data["miss_count"] >= 3:
-                    data["status"] = "RETIRED"
-                    data["death_date"] = now
-                    death_count += 1
-                    print(f"  [Notary] Death Event: {gid} ({data['game_name']})")
+        # DEATH Management (RETIRED games are never rescanned)
+        for gid in active_gids - live_ids:
+            data = registry[gid]
+            data["miss_count"] += 1
+            if data["miss_count"] >= 3:
+                data["status"] = "RETIRED"
+                data["death_date"] = now
+                death_count += 1
+                print(f"  [Notary] Death Event: {gid} ({data['game_name']})")
         
         span.set_attribute("birth_count", birth_count)
         span.set_attribute("death_count", death_count)
@@ -234,9 +267,14 @@ def process_audit(parsed_games, run_id, html_size_kb=0):
             "html_size_kb": html_size_kb
         })
 
-        # Save the updated registry
-        with open(REGISTRY_FILE, 'w') as f:
-            json.dump(registry, f, indent=2)
+        # Save the updated registry atomically: a crash mid-write leaves the
+        # previous registry intact instead of a truncated file
+        tmp_file = REGISTRY_FILE + ".tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(orjson.dumps(registry, option=orjson.OPT_INDENT_2))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, REGISTRY_FILE)
         
         print(f"[Notary] Audit Complete. Registry holds {len(registry)} total entries.")
         return registry
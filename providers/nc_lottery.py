@@ -1,9 +1,30 @@
 import time
 import random
 from typing import Dict, List, Optional
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
 from providers.base import LotteryProvider
 from user_agents import get_random_user_agent
+from text_utils import NON_DIGITS
+
+def has_class(name: str) -> str:
+    """XPath predicate equivalent to the CSS class selector '.name'"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+# Compiled once; the equivalents of the old CSS selectors.
+# Shared with sensor_nc, which extracts from the same page.
+BOXES_XP = etree.XPath(f"//div[{has_class('databox')}]")
+GAME_NUMBER_XP = etree.XPath(f".//span[{has_class('gamenumber')}]")
+GAME_LINK_XP = etree.XPath(f".//span[{has_class('gamename')}]//a")
+TABLE_XP = etree.XPath(f".//table[{has_class('datatable')}]")
+ROWS_XP = etree.XPath(".//tbody//tr")
+CELLS_XP = etree.XPath(".//td")
+
+def node_text(el, strip=True) -> str:
+    """Element text content; strip=True trims each text node like bs4's get_text(strip=True)"""
+    if strip:
+        return "".join(t.strip() for t in el.itertext())
+    return "".join(el.itertext())
 
 class NorthCarolinaProvider(LotteryProvider):
     """North Carolina Lottery Provider"""
@@ -22,37 +43,43 @@ class NorthCarolinaProvider(LotteryProvider):
     
     def extract_games(self, html_content: str) -> List[Dict]:
         """Extract games from NC Lottery HTML"""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        game_boxes = soup.select('div.databox')
+        doc = lxml.html.fromstring(html_content)
+        game_boxes = BOXES_XP(doc)
         
         if len(game_boxes) < self.safety_threshold:
             raise Exception(f"Safety Brake: Only {len(game_boxes)} games found (threshold: {self.safety_threshold})")
         
         games = []
         for box in game_boxes:
-            id_span = box.select_one('span.gamenumber')
-            game_id = "".join(filter(str.isdigit, id_span.get_text())) if id_span else None
+            id_spans = GAME_NUMBER_XP(box)
+            game_id = node_text(id_spans[0], strip=False).translate(NON_DIGITS) if id_spans else None
             
-            name_link = box.select_one('span.gamename a')
-            game_name = name_link.get_text(strip=True) if name_link else "Unknown"
+            name_links = GAME_LINK_XP(box)
+            name_link = name_links[0] if name_links else None
+            game_name = node_text(name_link) if name_link is not None else "Unknown"
             
             url_slug = "unknown"
-            if name_link and 'href' in name_link.attrs:
-                parts = name_link['href'].strip('/').split('/')
+            href = name_link.get('href') if name_link is not None else None
+            if href is not None:
+                parts = href.strip('/').split('/')
                 if len(parts) >= 3:
                     url_slug = parts[2]
             
             prizes = []
-            table = box.select_one('table.datatable')
-            if table:
-                rows = table.select('tbody tr')
+            tables = TABLE_XP(box)
+            if tables:
+                rows = ROWS_XP(tables[0])
                 for row in rows:
-                    cols = row.select('td')
+                    cols = CELLS_XP(row)
                     if len(cols) >= 4:
+                        value = node_text(cols[0])
+                        total = node_text(cols[2]).translate(NON_DIGITS)
                         prizes.append({
-                            "value": cols[0].get_text(strip=True),
-                            "odds": cols[1].get_text(strip=True).replace('1 in ', ''),
-                            "total": cols[2].get_text(strip=True).replace(',', '')
+                            "value": value,
+                            "value_int": int(value.translate(NON_DIGITS) or 0),
+                            "odds": node_text(cols[1]).replace('1 in ', ''),
+                            "total": total,
+                            "total_int": int(total or 0)
                         })
             
             if game_id:
@@ -72,9 +99,8 @@ class NorthCarolinaProvider(LotteryProvider):
         
         page = browser.new_page(user_agent=get_random_user_agent())
         try:
-            page.goto(url, timeout=30000, wait_until="networkidle")
-            time.sleep(1)
-            odds_val = page.query_selector('.odds.value')
+            page.goto(url, timeout=30000, wait_until="domcontentloaded")
+            odds_val = page.wait_for_selector('.odds.value', timeout=10000)
             if odds_val:
                 val = odds_val.inner_text().replace('1 in ', '').strip()
                 page.close()
@@ -1,15 +1,15 @@
 from playwright.sync_api import sync_playwright
 import os
-import time
-import random
 import uuid
 from datetime import datetime
-from bs4 import BeautifulSoup
+import lxml.html
 from pydantic import ValidationError
 from user_agents import get_random_user_agent
 from logger import setup_logger
 from opentelemetry import trace
-from models import validate_extracted_game, GameRaw, SensorOutput
+from models import GAMES_ADAPTER, validate_extracted_games, GameRaw, SensorOutput
+from providers.nc_lottery import BOXES_XP, GAME_NUMBER_XP, GAME_LINK_XP, TABLE_XP, ROWS_XP, CELLS_XP, node_text
+from text_utils import NON_DIGITS
 
 logger = setup_logger(__name__)
 tracer = trace.get_tracer(__name__)
@@ -17,26 +17,8 @@ tracer = trace.get_tracer(__name__)
 TARGET_URL = "https://nclottery.com/scratch-off-prizes-remaining"
 SAFETY_THRESHOLD = 40
 
-def fetch_game_dna(game_id, url_slug, browser):
-    """
-    Visit individual game page for Overall Odds.
-    """
-    url = f"https://nclottery.com/scratch-off/{game_id}/{url_slug}"
-    time.sleep(random.uniform(2, 4)) # Jitter
-    
-    page = browser.new_page(user_agent=get_random_user_agent())
-    try:
-        page.goto(url, timeout=30000, wait_until="networkidle")
-        time.sleep(1)
-        odds_val = page.query_selector('.odds.value')
-        if odds_val:
-            val = odds_val.inner_text().replace('1 in ', '').strip()
-            page.close()
-            return val
-    except Exception as e:
-        print(f"  [Sensor] Error fetching DNA for {game_id}: {e}")
-    page.close()
-    return "Unknown"
+# The evidence file is written as UTF-8; don't let libxml2 guess
+HTML_PARSER = lxml.html.HTMLParser(encoding="utf-8")
 
 def capture_session():
     """
@@ -61,20 +43,28 @@ def capture_session():
             
             try:
                 logger.info("Navigating to target", extra={"event": "navigation_start", "url": TARGET_URL, "run_id": run_id})
-                page.goto(TARGET_URL, timeout=60000, wait_until="networkidle")
-                time.sleep(random.uniform(3, 5)) # Settle jitter
+                page.goto(TARGET_URL, timeout=60000, wait_until="domcontentloaded")
+                # Wait for the game boxes, then for the load event, so the HTML
+                # evidence and the screenshot come from the same settled DOM
+                # (still no network-idle wait)
+                page.wait_for_selector('div.databox', state='attached', timeout=30000)
+                page.wait_for_load_state("load")
                 
                 # 1. Capture Raw HTML
-                html_content = page.content()
+                # Encoded once: the same bytes are written and measured, then dropped
+                html_bytes = page.content().encode("utf-8")
                 html_path = f"raw_html_{run_id}.html"
-                with open(html_path, "w", encoding="utf-8") as f:
-                    f.write(html_content)
+                with open(html_path, "wb") as f:
+                    f.write(html_bytes)
+                html_size_kb = len(html_bytes) / 1024
+                del html_bytes
                     
                 # 2. Capture Full Screenshot
-                screenshot_path = f"screenshot_{run_id}.png"
-                page.screenshot(path=screenshot_path, full_page=True)
+                # JPEG keeps the full page legible at a fraction of PNG's size and encode time
+                screenshot_path = f"screenshot_{run_id}.jpg"
+                page.screenshot(path=screenshot_path, full_page=True, type="jpeg", quality=75)
                 
-                html_size = round(len(html_content) / 1024, 2)
+                html_size = round(html_size_kb, 2)
                 span.set_attribute("html_size_kb", html_size)
                 
                 logger.info("Evidence captured", extra={
@@ -85,54 +75,56 @@ def capture_session():
                     "html_size_kb": html_size
                 })
                 
-                # 3. Extract Game Data
-                soup = BeautifulSoup(html_content, 'html.parser')
-                game_boxes = soup.select('div.databox')
+                # 3. Extract Game Data (parsed straight from the evidence file)
+                tree = lxml.html.parse(html_path, HTML_PARSER).getroot()
+                game_boxes = BOXES_XP(tree)
                 
                 if len(game_boxes) < SAFETY_THRESHOLD:
                     raise Exception(f"Safety Brake: Only {len(game_boxes)} games found.")
 
-                parsed_games = []
+                candidates = []
                 for box in game_boxes:
-                    id_span = box.select_one('span.gamenumber')
-                    game_id = "".join(filter(str.isdigit, id_span.get_text())) if id_span else None
+                    id_spans = GAME_NUMBER_XP(box)
+                    game_id = node_text(id_spans[0], strip=False).translate(NON_DIGITS) if id_spans else None
                     
-                    name_link = box.select_one('span.gamename a')
-                    game_name = name_link.get_text(strip=True) if name_link else "Unknown"
+                    name_links = GAME_LINK_XP(box)
+                    name_link = name_links[0] if name_links else None
+                    game_name = node_text(name_link) if name_link is not None else "Unknown"
                     
                     url_slug = "unknown"
-                    if name_link and 'href' in name_link.attrs:
-                        parts = name_link['href'].strip('/').split('/')
+                    href = name_link.get('href') if name_link is not None else None
+                    if href is not None:
+                        parts = href.strip('/').split('/')
                         if len(parts) >= 3:
                             url_slug = parts[2]
 
                     prizes = []
-                    table = box.select_one('table.datatable')
-                    if table:
-                        rows = table.select('tbody tr')
-                        for row in rows:
-                            cols = row.select('td')
+                    tables = TABLE_XP(box)
+                    if tables:
+                        for row in ROWS_XP(tables[0]):
+                            cols = CELLS_XP(row)
                             if len(cols) >= 4:
                                 prizes.append({
-                                    "value": cols[0].get_text(strip=True),
-                                    "odds": cols[1].get_text(strip=True),
-                                    "total": cols[2].get_text(strip=True)
+                                    "value": node_text(cols[0]),
+                                    "odds": node_text(cols[1]),
+                                    "total": node_text(cols[2])
                                 })
                     
                     if game_id and prizes:
-                        try:
-                            # PYDANTIC FORTRESS: Validate EVERY game at extraction
-                            validated_game = validate_extracted_game(
-                                game_id=game_id,
-                                game_name=game_name,
-                                url_slug=url_slug,
-                                prizes=prizes
-                            )
-                            parsed_games.append(validated_game)
-                        except ValidationError as ve:
-                            # Log validation failure but continue with other games
-                            logger.warning(f"Game {game_id} failed validation: {ve.error_count()} errors", 
-                                extra={"event": "validation_failed", "game_id": game_id, "errors": str(ve)})
+                        candidates.append({
+                            "game_id": game_id,
+                            "game_name": game_name,
+                            "url_slug": url_slug,
+                            "prizes": prizes
+                        })
+                
+                # PYDANTIC FORTRESS: Validate EVERY game at extraction (one batch call)
+                parsed_games, failures = validate_extracted_games(candidates)
+                for i, ve in failures.items():
+                    # Log validation failure but continue with other games
+                    game_id = candidates[i]["game_id"]
+                    logger.warning(f"Game {game_id} failed validation: {ve.error_count()} errors", 
+                        extra={"event": "validation_failed", "game_id": game_id, "errors": str(ve)})
                 
                 span.set_attribute("games_found", len(parsed_games))
                 
@@ -142,7 +134,7 @@ def capture_session():
                         run_id=run_id,
                         games=parsed_games,
                         html_path=html_path,
-                        html_size_kb=len(html_content) / 1024,
+                        html_size_kb=html_size_kb,
                         screenshot_path=screenshot_path
                     )
                     
@@ -157,9 +149,9 @@ def capture_session():
                     # Use mode='json' to convert Decimals to JSON-serializable types
                     return {
                         "run_id": run_id,
-                        "games": [g.model_dump(mode='json') for g in parsed_games],
+                        "games": GAMES_ADAPTER.dump_python(parsed_games, mode='json'),
                         "html_path": html_path,
-                        "html_size_kb": len(html_content) / 1024,
+                        "html_size_kb": html_size_kb,
                         "screenshot_path": screenshot_path,
                         "_validated": True  # Flag that data passed Pydantic
                     }
@@ -9,7 +9,9 @@ def setup_telemetry(service_name: str = "inventory-registry"):
     """
     Sets up OpenTelemetry tracing.
     
-    Defaults to Console exporter if OTEL_EXPORTER_OTLP_ENDPOINT is not set.
+    Exports via OTLP when OTEL_EXPORTER_OTLP_ENDPOINT is set. Otherwise spans
+    are recorded but not exported, unless OTEL_CONSOLE=1 asks for the Console
+    exporter (handy for local debugging).
     """
     
     # Create a Resource to identify the service
@@ -27,11 +29,14 @@ def setup_telemetry(service_name: str = "inventory-registry"):
         otlp_exporter = OTLPSpanExporter(endpoint=otlp_endpoint)
         provider.add_span_processor(BatchSpanProcessor(otlp_exporter))
         print(f"🔭 OTel: Configured OTLP exporter to {otlp_endpoint}")
-    else:
-        # Fallback to Console Exporter for local dev / no-setup
+    elif os.getenv("OTEL_CONSOLE"):
+        # Opt-in Console Exporter for local debugging
         console_exporter = ConsoleSpanExporter()
         provider.add_span_processor(BatchSpanProcessor(console_exporter))
         print("🔭 OTel: Configured Console exporter (local mode)")
+    else:
+        # No exporter: spans are never serialized or printed
+        print("🔭 OTel: No exporter configured (set OTEL_CONSOLE=1 for console spans)")
 
     # Set the global tracer provider
     trace.set_tracer_provider(provider)
@@ -4,6 +4,8 @@ test_differ.py - Tests for the Smart Inference System
 Validates change detection, hash computation, and delta generation.
 """
 
+import copy
+
 import pytest
 from differ import compute_data_hash, compute_delta, has_meaningful_changes
 
@@ -74,6 +76,68 @@ def test_prize_change_detected():
     assert hash1 != hash2, "Prize change should produce different hash"
 
 
+def test_hash_tracks_changes_across_repeated_calls():
+    """Cached per-game hashes must not hide a change or its reversal."""
+    def registry_with(total):
+        return {
+            "996": {
+                "game_id": "996",
+                "status": "ACTIVE",
+                "prizes": [{"value": "1000000", "total": total}]
+            }
+        }
+    
+    original = compute_data_hash(registry_with(5))
+    changed = compute_data_hash(registry_with(4))
+    
+    assert changed != original, "Changed prizes should produce a new hash"
+    assert compute_data_hash(registry_with(5)) == original, \
+        "Reverting the change should restore the original hash"
+
+
+def test_hash_sees_in_place_edits_and_leaves_input_untouched():
+    """Hashing must not memoize on (or otherwise modify) the registry it reads."""
+    registry = {
+        "996": {
+            "game_id": "996",
+            "status": "ACTIVE",
+            "prizes": [{"value": "1000000", "total": 5}]
+        }
+    }
+    snapshot = copy.deepcopy(registry)
+    
+    original = compute_data_hash(registry)
+    assert registry == snapshot, "Hashing should leave the registry unchanged"
+    
+    registry["996"]["prizes"][0]["total"] = 4
+    edited_total = compute_data_hash(registry)
+    assert edited_total != original, "An in-place prize edit should change the hash"
+    
+    registry["996"]["status"] = "RETIRED"
+    assert compute_data_hash(registry) != edited_total, "An in-place status edit should change the hash"
+
+
+def test_delta_sees_in_place_edits():
+    """A registry edited in place after an earlier delta still yields its prize changes."""
+    old_registry = {
+        "996": {
+            "game_id": "996",
+            "game_name": "Test Game",
+            "status": "ACTIVE",
+            "prizes": [{"value": "1000", "total": 10}]
+        }
+    }
+    new_registry = copy.deepcopy(old_registry)
+    
+    assert compute_delta(old_registry, new_registry, "run_1")["prize_changes"] == []
+    
+    new_registry["996"]["prizes"][0]["total"] = 9
+    delta = compute_delta(old_registry, new_registry, "run_2")
+    
+    assert len(delta["prize_changes"]) == 1
+    assert new_registry["996"].keys() == {"game_id", "game_name", "status", "prizes"}
+
+
 def test_delta_detects_prize_change():
     """Delta should capture prize changes with meaning."""
     old_registry = {
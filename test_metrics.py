@@ -0,0 +1,63 @@
+"""
+test_metrics.py - Tests for the metrics export
+
+Validates JSONL appends, the periodic trim, and tail reads.
+"""
+
+import pytest
+import metrics
+from metrics import export_metrics, get_latest_metrics, METRICS_WINDOW, TRIM_SLACK
+
+
+@pytest.fixture(autouse=True)
+def metrics_dir(tmp_path, monkeypatch):
+    """Each test gets its own empty working directory for metrics.jsonl."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def _line_count():
+    with open(metrics.METRICS_FILE, 'rb') as f:
+        return sum(1 for _ in f)
+
+
+def test_export_appends_one_line_per_run():
+    """Each export adds exactly one JSON line carrying the run id and metrics."""
+    export_metrics("run_1", {"game_count": 40})
+    export_metrics("run_2", {"game_count": 41})
+    
+    assert _line_count() == 2
+    latest = get_latest_metrics()
+    assert [m["run_id"] for m in latest] == ["run_1", "run_2"]
+    assert latest[1]["game_count"] == 41
+    assert latest[1]["timestamp"].endswith("Z")
+
+
+def test_file_is_trimmed_back_to_window(metrics_dir):
+    """The file may run TRIM_SLACK past the window, then is cut to the newest entries."""
+    total = METRICS_WINDOW + TRIM_SLACK + 5
+    for i in range(total):
+        export_metrics(f"run_{i:04d}", {"game_count": 40})
+        assert _line_count() <= METRICS_WINDOW + TRIM_SLACK + 1
+    
+    remaining = get_latest_metrics(count=METRICS_WINDOW + TRIM_SLACK)
+    assert len(remaining) < METRICS_WINDOW + TRIM_SLACK
+    assert remaining[-1]["run_id"] == f"run_{total - 1:04d}"
+    assert not list(metrics_dir.glob("*.tmp")), "The trim should leave no temp file behind"
+
+
+def test_get_latest_metrics_returns_newest_entries():
+    """Only the requested number of entries is returned, oldest first."""
+    for i in range(15):
+        export_metrics(f"run_{i}", {"game_count": i})
+    
+    assert [m["game_count"] for m in get_latest_metrics(count=3)] == [12, 13, 14]
+
+
+def test_get_latest_metrics_without_file():
+    """No metrics file yet means no entries."""
+    assert get_latest_metrics() == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
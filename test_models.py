@@ -0,0 +1,88 @@
+"""
+test_models.py - Tests for the Data Fortress
+
+Validates batch extraction validation, its per-game fallback, and the
+prize totals.
+"""
+
+import pytest
+from decimal import Decimal
+from models import GameRaw, Prize, SensorOutput, validate_extracted_games
+
+
+def _game(game_id, total="2,448", name=None):
+    return {
+        "game_id": game_id,
+        "game_name": f"Game {game_id}" if name is None else name,
+        "url_slug": f"game-{game_id}",
+        "prizes": [
+            {"value": "$1,000,000", "odds": "1 in 1,469,394", "total": total},
+            {"value": "$500", "odds": "7,500", "total": "12"}
+        ]
+    }
+
+
+def test_all_valid_batch():
+    """A clean batch validates in one call, in input order, with no failures."""
+    games, failures = validate_extracted_games([_game("996"), _game("997"), _game("998")])
+    
+    assert failures == {}
+    assert [g.game_id for g in games] == ["996", "997", "998"]
+    assert all(isinstance(g, GameRaw) for g in games)
+    
+    prize = games[0].prizes[0]
+    assert prize.value == Decimal("1000000")
+    assert prize.odds == Decimal("1469394")
+    assert prize.total == 2448
+    assert prize.raw_total == "2,448"
+
+
+def test_bad_prize_is_dropped_and_keyed_by_index():
+    """One malformed prize rejects only its game; the rest keep their order."""
+    batch = [_game("996"), _game("997", total="N/A"), _game("998")]
+    
+    games, failures = validate_extracted_games(batch)
+    
+    assert [g.game_id for g in games] == ["996", "998"]
+    assert list(failures) == [1]
+    assert "total" in str(failures[1])
+
+
+def test_game_level_error_is_reported():
+    """Errors on the game itself (empty game_id) are caught like prize errors."""
+    batch = [_game(""), _game("997"), _game("998", name="")]
+    
+    games, failures = validate_extracted_games(batch)
+    
+    assert [g.game_id for g in games] == ["997"]
+    assert sorted(failures) == [0, 2]
+    assert "game_id" in str(failures[0])
+    assert "game_name" in str(failures[2])
+
+
+def test_totals_follow_edits_after_validation():
+    """Totals reflect prizes changed after validation, not the validated snapshot."""
+    games, _ = validate_extracted_games([_game("996"), _game("997")])
+    game = games[0]
+    assert game.total_remaining_value() == Decimal("2448006000")
+    
+    extra = Prize(value="$10", odds="5", total="3", raw_value="$10", raw_odds="5", raw_total="3")
+    
+    copied = game.model_copy(update={"prizes": [extra]})
+    assert copied.total_remaining_value() == Decimal("30")
+    assert game.total_remaining_value() == Decimal("2448006000")
+    
+    game.prizes.append(extra)
+    assert game.total_remaining_value() == Decimal("2448006030")
+    
+    games[1].prizes = [extra]
+    output = SensorOutput(run_id="run", games=games, html_path="e.html",
+                          html_size_kb=1, screenshot_path="e.png")
+    assert output.total_universe_value() == Decimal("2448006060")
+    
+    output.games.append(copied)
+    assert output.total_universe_value() == Decimal("2448006090")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
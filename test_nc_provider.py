@@ -0,0 +1,68 @@
+"""
+test_nc_provider.py - Tests for the NC Lottery page extraction
+
+Runs the shared lxml selectors (also used by sensor_nc) over a fixture page.
+"""
+
+import pytest
+from providers.nc_lottery import NorthCarolinaProvider
+
+
+def _game_box(game_id, extra_class=""):
+    """One databox as the NC 'prizes remaining' page renders it."""
+    return f"""
+    <div class="databox {extra_class}">
+        <span class="gamenumber">Game # {game_id}</span>
+        <span class="gamename"><a href="/scratch-off/{game_id}/lucky-{game_id}/">Lucky <b>7s</b> &amp; More</a></span>
+        <table class="datatable">
+            <thead><tr><th>Value</th><th>Odds</th><th>Remaining</th><th>Total</th></tr></thead>
+            <tbody>
+                <tr><td> $1,000,000 </td><td>1 in 1,469,394</td><td>2,448</td><td>4</td></tr>
+                <tr><td>$500</td><td>1 in 7,500</td><td>12</td><td>40</td></tr>
+                <tr><td colspan="4">Prize claim deadline applies</td></tr>
+            </tbody>
+        </table>
+    </div>"""
+
+
+def _page(game_count=40, extra=""):
+    boxes = "".join(_game_box(900 + i, "featured" if i == 0 else "") for i in range(game_count))
+    return f"<html><head><script>var x = '<div class=\"databox\">';</script></head><body>{boxes}{extra}</body></html>"
+
+
+def test_extracts_every_game_box():
+    """Boxes with extra classes count; markup inside scripts does not."""
+    games = NorthCarolinaProvider().extract_games(_page())
+    
+    assert len(games) == 40
+    assert [g["game_id"] for g in games][:2] == ["900", "901"]
+
+
+def test_extracted_fields_match_page_text():
+    """Text is stripped per node and joined, entities decoded, slug taken from the link."""
+    game = NorthCarolinaProvider().extract_games(_page())[0]
+    
+    assert game["game_name"] == "Lucky7s& More"
+    assert game["url_slug"] == "lucky-900"
+    assert game["prizes"] == [
+        {"value": "$1,000,000", "value_int": 1000000, "odds": "1,469,394", "total": "2448", "total_int": 2448},
+        {"value": "$500", "value_int": 500, "odds": "7,500", "total": "12", "total_int": 12},
+    ]
+
+
+def test_box_without_link_or_table():
+    """A box missing its name link and table still yields a game with defaults."""
+    extra = '<div class="databox"><span class="gamenumber">Game # 123</span></div>'
+    games = NorthCarolinaProvider().extract_games(_page(extra=extra))
+    
+    assert games[-1] == {"game_id": "123", "game_name": "Unknown", "url_slug": "unknown", "prizes": []}
+
+
+def test_safety_brake_on_short_page():
+    """Fewer boxes than the safety threshold aborts extraction."""
+    with pytest.raises(Exception, match="Safety Brake"):
+        NorthCarolinaProvider().extract_games(_page(game_count=39))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
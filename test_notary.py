@@ -1,6 +1,27 @@
 import pytest
 import json
-from notary import process_audit
+import notary
+from notary import process_audit, calculate_total_wealth, calculate_top_prize_sum
+
+
+@pytest.fixture
+def audit_dir(tmp_path, monkeypatch):
+    """Run the Notary against an empty working directory with a fresh pulse window"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(notary, "_PULSE", None)
+    return tmp_path
+
+
+def make_games(ids, value="$10", total="5"):
+    return [
+        {
+            "game_id": str(i),
+            "game_name": f"Game {i}",
+            "url_slug": f"game-{i}",
+            "prizes": [{"value": value, "odds": "5", "total": total}]
+        }
+        for i in ids
+    ]
 
 def test_notary_rejects_low_game_count():
     """Notary should reject runs with too few games (below SAFETY_THRESHOLD)"""
@@ -66,11 +87,99 @@ def test_notary_statistical_validation():
     assert result is not None
 
 
-def test_notary_retirement_logic():
+def test_pulse_is_written_on_every_audit(audit_dir):
+    """Each audit persists its pulse entry before returning"""
+    for run in range(3):
+        assert process_audit(make_games(range(50)), f"run_{run}") is not None
+        history = json.loads((audit_dir / "pulse_history.json").read_text())
+        assert [h["run_id"] for h in history] == [f"run_{r}" for r in range(run + 1)]
+
+
+def audit(audit_dir, games, run_id):
+    """Run one audit; return (returned registry, saved registry, pulse entry)"""
+    result = process_audit(games, run_id)
+    saved = json.loads((audit_dir / "registry.json").read_text())
+    pulse = json.loads((audit_dir / "pulse_history.json").read_text())[-1]
+    return result, saved, pulse
+
+
+def assert_pulse_matches(pulse, registry):
+    assert pulse["total_wealth"] == calculate_total_wealth(registry)
+    assert pulse["top_prize_sum"] == calculate_top_prize_sum(registry)
+
+
+def test_audit_birth_totals_match_registry(audit_dir):
+    _, saved, pulse = audit(audit_dir, make_games(range(50)), "run_birth")
+    assert len(saved) == 50
+    assert all(g["status"] == "ACTIVE" for g in saved.values())
+    assert pulse["birth_count"] == 50
+    assert pulse["total_wealth"] == 50 * 10 * 5
+    assert_pulse_matches(pulse, saved)
+
+
+def test_audit_stasis_totals_match_registry(audit_dir):
+    audit(audit_dir, make_games(range(50)), "run_1")
+    games = make_games(range(50), value="$10", total="4")
+    # Provider rows carry pre-parsed ints
+    games[0]["prizes"] = [{"value": "$20", "odds": "5", "total": "3", "value_int": 20, "total_int": 3}]
+    _, saved, pulse = audit(audit_dir, games, "run_2")
+    assert pulse["birth_count"] == 0
+    assert saved["1"]["prizes"][0]["total"] == "4"
+    assert_pulse_matches(pulse, saved)
+
+
+def test_audit_retired_game_comes_back(audit_dir):
+    audit(audit_dir, make_games(range(50)), "run_1")
+    registry = json.loads((audit_dir / "registry.json").read_text())
+    registry["0"].update({"status": "RETIRED", "miss_count": 3})
+    (audit_dir / "registry.json").write_text(json.dumps(registry))
+    
+    _, saved, pulse = audit(audit_dir, make_games(range(50)), "run_2")
+    assert saved["0"]["status"] == "ACTIVE"
+    assert saved["0"]["miss_count"] == 0
+    assert pulse["birth_count"] == 0
+    assert pulse["total_wealth"] == 50 * 10 * 5
+    assert_pulse_matches(pulse, saved)
+
+
+def test_audit_duplicate_game_ids_last_wins(audit_dir):
+    audit(audit_dir, make_games(range(50)), "run_1")
+    games = make_games(range(50)) + make_games([7], value="$30")
+    _, saved, pulse = audit(audit_dir, games, "run_2")
+    assert saved["7"]["prizes"][0]["value"] == "$30"
+    assert pulse["total_wealth"] == 49 * 10 * 5 + 30 * 5
+    assert_pulse_matches(pulse, saved)
+
+
+def test_notary_retirement_logic(audit_dir):
     """Games missing for 3+ runs should be marked RETIRED"""
-    # This would require multiple runs and state persistence
-    # Leaving as TODO for integration tests
-    pass
+    audit(audit_dir, make_games(range(50)), "run_0")
+    for run in (1, 2):
+        _, saved, pulse = audit(audit_dir, make_games(range(1, 50)), f"run_{run}")
+        assert saved["0"]["status"] == "ACTIVE"
+        assert saved["0"]["miss_count"] == run
+        assert pulse["death_count"] == 0
+        assert_pulse_matches(pulse, saved)
+    
+    _, saved, pulse = audit(audit_dir, make_games(range(1, 50)), "run_3")
+    assert saved["0"]["status"] == "RETIRED"
+    assert saved["0"]["death_date"] is not None
+    assert pulse["death_count"] == 1
+    # The pulse records the totals the integrity checks saw, which are
+    # projected before this run's deaths are applied
+    saved["0"]["status"] = "ACTIVE"
+    assert_pulse_matches(pulse, saved)
+
+
+def test_audit_hard_check_abort_leaves_registry_untouched(audit_dir):
+    audit(audit_dir, make_games(range(50)), "run_1")
+    before = (audit_dir / "registry.json").read_bytes()
+    
+    assert process_audit(make_games(range(50), value="$1"), "run_crash") is None
+    assert (audit_dir / "registry.json").read_bytes() == before
+    assert not (audit_dir / "registry.json.tmp").exists()
+    history = json.loads((audit_dir / "pulse_history.json").read_text())
+    assert [h["run_id"] for h in history] == ["run_1"]
 
 
 if __name__ == "__main__":
@@ -0,0 +1,4 @@
+# Text cleanup helpers shared by the extractors and the Notary
+
+# Deletes every non-digit (Latin-1 range) in a single str.translate pass
+NON_DIGITS = str.maketrans("", "", "".join(chr(c) for c in range(256) if not chr(c).isdecimal()))
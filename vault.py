@@ -1,7 +1,11 @@
 import os
-import json
-import boto3
-from botocore.config import Config
+import gzip
+import hashlib
+import functools
+import mimetypes
+import orjson
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from differ import (
     compute_data_hash, 
@@ -11,6 +15,77 @@ from differ import (
     save_cached_hash
 )
 
+# Telemetry files mirrored to the bucket root and archived every run
+TELEMETRY_FILES = [
+    ("pulse_history.json", "application/json"),
+    ("metrics.jsonl", "application/x-ndjson"),
+]
+# (file, mime, base, ext), split once for the per-run archive names
+_TELEMETRY_PARTS = [(name, mime, *os.path.splitext(name)) for name, mime in TELEMETRY_FILES]
+
+# Independent uploads run side by side; large files go multipart
+UPLOAD_WORKERS = 8
+
+# sha256 -> R2 key of recently uploaded evidence, so an identical capture is
+# copied server-side to its run's key instead of uploaded again
+# (kept next to .last_registry_hash, same lifetime)
+EVIDENCE_HASH_CACHE = ".evidence_hashes.json"
+EVIDENCE_HASH_LIMIT = 50
+
+# Local copy of the last archived registry, so the delta doesn't need to
+# download it again (trusted only if it matches .last_registry_hash).
+# Like the other local state files, it only exists where it survives between
+# runs (CI restores them with actions/cache); without it the previous
+# registry is downloaded from the live mirror.
+PREVIOUS_REGISTRY_CACHE = ".previous_registry.json.gz"
+
+# One client per process so connections and endpoint metadata are reused.
+# boto3 itself is only imported once a sync actually happens.
+_S3_CLIENT = None
+_S3_LOCK = threading.Lock()
+
+
+def _get_s3():
+    """Lazily builds the shared R2 client (thread-safe, built at most once)."""
+    global _S3_CLIENT
+    if _S3_CLIENT is not None:
+        return _S3_CLIENT
+    with _S3_LOCK:
+        if _S3_CLIENT is None:
+            import boto3.session
+            from botocore.config import Config
+            # A private session: the client doesn't touch boto3's global default session
+            _S3_CLIENT = boto3.session.Session().client(
+                's3',
+                endpoint_url=os.getenv('R2_ENDPOINT'),
+                aws_access_key_id=os.getenv('R2_ACCESS_KEY'),
+                aws_secret_access_key=os.getenv('R2_SECRET_KEY'),
+                config=Config(
+                    signature_version='s3v4',
+                    # Room for every upload worker plus TransferManager's part threads
+                    max_pool_connections=50,
+                    retries={'max_attempts': 5, 'mode': 'adaptive'},
+                    tcp_keepalive=True
+                )
+            )
+    return _S3_CLIENT
+
+
+@functools.lru_cache(maxsize=1)
+def _transfer_config():
+    """
+    TransferConfig for upload_file (built on first upload). Only the screenshot
+    still goes through upload_file; multi-MB full-page captures are split into
+    4MB parts uploaded in parallel, while the JSON objects stay single PUTs.
+    """
+    from boto3.s3.transfer import TransferConfig
+    return TransferConfig(
+        multipart_threshold=4 * 1024 * 1024,
+        multipart_chunksize=4 * 1024 * 1024,
+        max_concurrency=8,
+        use_threads=True
+    )
+
 
 def upload_to_vault(run_id, html_path, screenshot_path, registry_path="registry.json"):
     """
@@ -25,13 +100,7 @@ def upload_to_vault(run_id, html_path, screenshot_path, registry_path="registry.
 
     print(f"--- Starting Smart Vault Sync: {run_id} ---")
     
-    s3 = boto3.client(
-        's3',
-        endpoint_url=os.getenv('R2_ENDPOINT'),
-        aws_access_key_id=os.getenv('R2_ACCESS_KEY'),
-        aws_secret_access_key=os.getenv('R2_SECRET_KEY'),
-        config=Config(signature_version='s3v4')
-    )
+    s3 = _get_s3()
 
     bucket = os.getenv('R2_BUCKET')
     now = datetime.now()
@@ -39,9 +108,12 @@ def upload_to_vault(run_id, html_path, screenshot_path, registry_path="registry.
     date_str = now.strftime("%Y-%m-%d")
     
     # === SMART DEDUPLICATION ===
-    # Load current registry and compute hash
-    with open(registry_path, 'r') as f:
-        current_registry = json.load(f)
+    # Load current registry and compute hash. The file is read once; its bytes
+    # are reused for the snapshot and the live mirror. The hash is computed over the parsed games,
+    # not these bytes, so per-run fields like last_seen don't count as changes.
+    with open(registry_path, 'rb') as f:
+        registry_bytes = f.read()
+    current_registry = orjson.loads(registry_bytes)
     
     current_hash = compute_data_hash(current_registry)
     previous_hash = load_cached_hash()
@@ -55,45 +127,56 @@ def upload_to_vault(run_id, html_path, screenshot_path, registry_path="registry.
         print(f"[Vault] DATA CHANGED! Old hash: {previous_hash[:8] if previous_hash else 'None'}... -> New hash: {current_hash[:8]}...")
     
     try:
-        # === ALWAYS: Update live root mirrors ===
-        _upload_live_mirrors(s3, bucket, registry_path)
+        snapshot_key = None
+        previous_registry = None
         
-        # === ONLY ON CHANGE: Archive snapshot + Generate delta ===
+        # === ONLY ON CHANGE: Archive snapshot ===
         if data_changed:
-            # Load previous registry for delta computation
-            previous_registry = _load_previous_registry(s3, bucket)
+            # Load previous registry for delta computation (before the live
+            # mirror below replaces it)
+            previous_registry = _load_previous_registry(s3, bucket, previous_hash)
             
-            if previous_registry:
-                delta = compute_delta(previous_registry, current_registry, run_id)
-                
-                if has_meaningful_changes(delta):
-                    # Save and upload delta
-                    _upload_delta(s3, bucket, delta, date_path, date_str)
-                    
-                    # Update rolling changelog
-                    _update_changelog(s3, bucket, delta)
-                    
-                    print(f"[Vault] Delta summary: {delta['summary']}")
-            
-            # Archive the registry snapshot (only on change)
             archive_name = f"registry_{run_id}.json"
-            r2_key = f"registry_history/{date_path}/{archive_name}"
-            s3.upload_file(registry_path, bucket, r2_key, ExtraArgs={'ContentType': 'application/json'})
-            print(f"  [Vault] Archived snapshot -> {r2_key}")
+            snapshot_key = f"registry_history/{date_path}/{archive_name}"
+            _gzip_put(s3, bucket, snapshot_key, registry_bytes, 'application/json')
+            print(f"  [Vault] Archived snapshot -> {snapshot_key}")
+        
+        # Everything below is independent once the snapshot is stored,
+        # so it all goes out as one concurrent batch
+        
+        # === ALWAYS: Update live registry mirror ===
+        uploads = _live_mirror_uploads(s3, bucket, registry_bytes, snapshot_key)
+        
+        # === ONLY ON CHANGE: Generate delta ===
+        if previous_registry:
+            delta = compute_delta(previous_registry, current_registry, run_id)
             
-            # Save new hash for next comparison
-            save_cached_hash(current_hash)
+            if has_meaningful_changes(delta):
+                print(f"[Vault] Delta summary: {delta['summary']}")
+                # Save and upload delta, update rolling changelog
+                delta_key = _delta_key(date_path, date_str)
+                uploads.append(lambda: _upload_delta(s3, bucket, delta, delta_key))
+                uploads.append(lambda: _update_changelog(s3, bucket, delta, delta_key, now.isoformat()))
         
-        # === ALWAYS: Upload evidence files ===
-        _upload_evidence(s3, bucket, html_path, screenshot_path, date_path)
+        # === ALWAYS: Upload evidence files + telemetry (archive + live mirror) ===
+        evidence_hashes = _load_evidence_hashes()
+        uploads += _evidence_uploads(s3, bucket, html_path, screenshot_path, date_path, evidence_hashes)
+        uploads += _telemetry_uploads(s3, bucket, run_id, date_path)
+        _run_uploads(uploads)
+        _save_evidence_hashes(evidence_hashes)
         
-        # === ALWAYS: Upload telemetry ===
-        _upload_telemetry(s3, bucket, run_id, date_path)
+        if data_changed:
+            # Save new hash (and the registry it describes) for next comparison,
+            # only once the sync has succeeded
+            _save_previous_registry(registry_bytes)
+            save_cached_hash(current_hash)
         
         # Cleanup local evidence files
         for path in [html_path, screenshot_path]:
-            if os.path.exists(path):
+            try:
                 os.remove(path)
+            except FileNotFoundError:
+                pass
         
         status = "CHANGED" if data_changed else "UNCHANGED"
         print(f"[Vault] Sync Complete. Status: {status}")
@@ -104,49 +187,145 @@ def upload_to_vault(run_id, html_path, screenshot_path, registry_path="registry.
         return False
 
 
-def _upload_live_mirrors(s3, bucket, registry_path):
-    """Upload the live versions of registry and telemetry to bucket root."""
-    # Live registry
-    s3.upload_file(registry_path, bucket, "registry.json", ExtraArgs={'ContentType': 'application/json'})
-    print("  [Vault] Updated live mirror -> registry.json")
+def _upload_task(s3, bucket, local, r2_key, mime, label=None, metadata=None):
+    """A deferred upload_file call, run later by _run_uploads."""
+    extra_args = {'ContentType': mime}
+    if metadata:
+        extra_args['Metadata'] = metadata
     
-    # Live telemetry
-    for telemetry_file in ["pulse_history.json", "metrics.json"]:
-        if os.path.exists(telemetry_file):
-            s3.upload_file(telemetry_file, bucket, telemetry_file, ExtraArgs={'ContentType': 'application/json'})
+    def task():
+        s3.upload_file(local, bucket, r2_key, ExtraArgs=extra_args, Config=_transfer_config())
+        return f"{label} -> {r2_key}" if label else None
+    return task
 
 
-def _load_previous_registry(s3, bucket) -> dict:
-    """Download the previous registry from R2 for delta comparison."""
+def _gzip_put(s3, bucket, r2_key, raw: bytes, mime, metadata=None) -> int:
+    """
+    put_object of gzip-compressed bytes with ContentEncoding: gzip.
+    Browsers decode these transparently; boto3 readers go through _read_body.
+    Returns the compressed size.
+    """
+    body = gzip.compress(raw, compresslevel=6)
+    extra = {'Metadata': metadata} if metadata else {}
+    s3.put_object(Bucket=bucket, Key=r2_key, Body=body, ContentType=mime, ContentEncoding='gzip', **extra)
+    return len(body)
+
+
+def _gzip_file_task(s3, bucket, local, r2_key, mime, label=None):
+    """A deferred _gzip_put of a local file, run later by _run_uploads."""
+    def task():
+        with open(local, 'rb') as f:
+            _gzip_put(s3, bucket, r2_key, f.read(), mime)
+        return f"{label} -> {r2_key}" if label else None
+    return task
+
+
+def _upload_json(s3, bucket, r2_key, obj):
+    """Upload an object as compact (unindented), gzip-encoded JSON."""
+    _gzip_put(s3, bucket, r2_key, orjson.dumps(obj), 'application/json')
+
+
+def _read_body(response) -> bytes:
+    """get_object payload, gunzipped if it was stored gzip-encoded."""
+    body = response['Body'].read()
+    if response.get('ContentEncoding') == 'gzip':
+        body = gzip.decompress(body)
+    return body
+
+
+def _run_uploads(tasks):
+    """
+    Run independent uploads concurrently; re-raises the first failure.
+    Each task returns an optional log line, printed in submission order.
+    """
+    if not tasks:
+        return
+    with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as pool:
+        for future in [pool.submit(task) for task in tasks]:
+            message = future.result()
+            if message:
+                print(f"  [Vault] {message}")
+
+
+def _copy_to_mirror(s3, bucket, archive_key, live_key, mime):
+    """Server-side copy of an archived (gzip-encoded) object to its live root key."""
+    s3.copy_object(
+        Bucket=bucket,
+        Key=live_key,
+        CopySource={'Bucket': bucket, 'Key': archive_key},
+        ContentType=mime,
+        ContentEncoding='gzip',
+        MetadataDirective='REPLACE'
+    )
+
+
+def _live_mirror_uploads(s3, bucket, registry_bytes: bytes, snapshot_key=None):
+    """
+    Upload tasks for the live registry at bucket root.
+    When this run archived a snapshot, the mirror is a server-side copy of it
+    instead of a second upload of the same bytes; otherwise the bytes already
+    read for the hash are uploaded as-is.
+    """
+    if snapshot_key:
+        def mirror_registry():
+            _copy_to_mirror(s3, bucket, snapshot_key, "registry.json", 'application/json')
+            return "Updated live mirror -> registry.json (copied from snapshot)"
+        return [mirror_registry]
+    def mirror_registry():
+        _gzip_put(s3, bucket, "registry.json", registry_bytes, 'application/json')
+        return "Updated live mirror -> registry.json"
+    return [mirror_registry]
+
+
+def _load_previous_registry(s3, bucket, previous_hash=None) -> dict:
+    """
+    Previous registry for delta comparison: the local cache when its hash
+    matches previous_hash, otherwise downloaded from R2.
+    """
+    if previous_hash:
+        try:
+            with open(PREVIOUS_REGISTRY_CACHE, 'rb') as f:
+                cached = orjson.loads(gzip.decompress(f.read()))
+            if compute_data_hash(cached) == previous_hash:
+                print("  [Vault] Loaded previous registry from local cache")
+                return cached
+        except (OSError, EOFError, orjson.JSONDecodeError):
+            pass
+    
     try:
         response = s3.get_object(Bucket=bucket, Key="registry.json")
-        return json.loads(response['Body'].read().decode('utf-8'))
+        return orjson.loads(_read_body(response))
     except Exception as e:
         print(f"  [Vault] Could not load previous registry: {e}")
         return {}
 
 
-def _upload_delta(s3, bucket, delta: dict, date_path: str, date_str: str):
-    """Upload the delta file to daily_deltas/YYYY/MM/delta_YYYY-MM-DD.json"""
-    delta_filename = f"delta_{date_str}.json"
-    local_delta_path = f"delta_{date_str}.json"
-    
-    with open(local_delta_path, 'w') as f:
-        json.dump(delta, f, indent=2)
-    
-    r2_key = f"daily_deltas/{date_path}/{delta_filename}"
-    s3.upload_file(local_delta_path, bucket, r2_key, ExtraArgs={'ContentType': 'application/json'})
-    print(f"  [Vault] Uploaded delta -> {r2_key}")
-    
-    # Cleanup local delta file
-    os.remove(local_delta_path)
+def _save_previous_registry(registry_bytes: bytes):
+    """Keep this run's registry locally as the next run's previous registry."""
+    with open(PREVIOUS_REGISTRY_CACHE, 'wb') as f:
+        f.write(gzip.compress(registry_bytes, compresslevel=6))
+
+
+def _delta_key(date_path: str, date_str: str) -> str:
+    """R2 key of a day's delta: daily_deltas/YYYY/MM/delta_YYYY-MM-DD.json"""
+    return f"daily_deltas/{date_path}/delta_{date_str}.json"
 
 
-def _update_changelog(s3, bucket, delta: dict):
-    """Update the rolling changelog.json at bucket root (last 90 days)."""
+def _upload_delta(s3, bucket, delta: dict, r2_key: str):
+    """Upload the delta file to its daily_deltas/ key (returns a log line)"""
+    _upload_json(s3, bucket, r2_key, delta)
+    return f"Uploaded delta -> {r2_key}"
+
+
+def _update_changelog(s3, bucket, delta: dict, delta_key: str, generated_at: str):
+    """
+    Update the rolling changelog.json at bucket root (last 90 days). Returns a log line.
+    delta_key and generated_at come from the run, so every artifact of one
+    sync shares the same date partition and timestamp.
+    """
     try:
         response = s3.get_object(Bucket=bucket, Key="changelog.json")
-        changelog = json.loads(response['Body'].read().decode('utf-8'))
+        changelog = orjson.loads(_read_body(response))
     except:
         changelog = {"schema_version": "1.0", "entries": []}
     
@@ -162,45 +341,126 @@ def _update_changelog(s3, bucket, delta: dict):
         "games_retired": len(delta["games_retired"]),
         "prizes_changed": len(delta["prize_changes"]),
         "summary": delta["summary"],
-        "delta_file": f"daily_deltas/{datetime.now().strftime('%Y/%m')}/delta_{delta['date']}.json"
+        "delta_file": delta_key
     }
     
     changelog["entries"].insert(0, entry)
-    changelog["generated_at"] = datetime.now().isoformat()
+    changelog["generated_at"] = generated_at
     
     # Keep only last 90 days
     changelog["entries"] = changelog["entries"][:90]
     
-    # Upload
-    local_changelog = "changelog_temp.json"
-    with open(local_changelog, 'w') as f:
-        json.dump(changelog, f, indent=2)
-    
-    s3.upload_file(local_changelog, bucket, "changelog.json", ExtraArgs={'ContentType': 'application/json'})
-    print("  [Vault] Updated changelog.json")
+    # Upload straight from memory
+    _upload_json(s3, bucket, "changelog.json", changelog)
+    return "Updated changelog.json"
+
+
+def _file_sha256(path) -> str:
+    """sha256 hex digest of a file, streamed in 64KB chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _load_evidence_hashes() -> dict:
+    """Load the sha256 -> R2 key map of recently uploaded evidence."""
+    try:
+        with open(EVIDENCE_HASH_CACHE, 'rb') as f:
+            return orjson.loads(f.read())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        return {}
+
+
+def _save_evidence_hashes(hashes: dict):
+    """Persist the most recent EVIDENCE_HASH_LIMIT evidence hashes."""
+    recent = dict(list(hashes.items())[-EVIDENCE_HASH_LIMIT:])
+    with open(EVIDENCE_HASH_CACHE, 'wb') as f:
+        f.write(orjson.dumps(recent))
+
+
+def _evidence_task(s3, bucket, digest, r2_key, known_hashes, upload):
+    """
+    Task storing one evidence file under this run's key (returns a log line).
     
-    os.remove(local_changelog)
+    Content already stored under an earlier key in known_hashes is copied
+    server-side instead of uploaded again, so every run still has its own
+    evidence object. If that earlier object is gone, the file is uploaded.
+    """
+    def task():
+        known_key = known_hashes.get(digest)
+        if known_key:
+            try:
+                s3.copy_object(Bucket=bucket, Key=r2_key, CopySource={'Bucket': bucket, 'Key': known_key})
+                return f"Copied identical {known_key} -> {r2_key}"
+            except Exception:
+                pass
+        message = upload()
+        known_hashes[digest] = r2_key
+        return message
+    return task
 
 
-def _upload_evidence(s3, bucket, html_path, screenshot_path, date_path):
-    """Upload raw evidence files (HTML + screenshot)."""
-    evidence = [
-        (html_path, "raw_html", "text/html"),
-        (screenshot_path, "full_screenshot", "image/png"),
-    ]
+def _evidence_uploads(s3, bucket, html_path, screenshot_path, date_path, known_hashes):
+    """
+    Upload tasks for the raw evidence files (HTML + screenshot).
     
-    for local, folder, mime in evidence:
-        if os.path.exists(local):
-            r2_key = f"{folder}/{date_path}/{os.path.basename(local)}"
-            s3.upload_file(local, bucket, r2_key, ExtraArgs={'ContentType': mime})
-            print(f"  [Vault] Uploaded {local} -> {r2_key}")
+    Uploaded files carry their sha256 as 'sha256' metadata and are added to
+    known_hashes; a later capture with the same digest is copied from that
+    object (see _evidence_task).
+    HTML is stored gzip-encoded under its usual key; clients that honor
+    Content-Encoding (browsers, curl --compressed) get the original bytes back.
+    """
+    uploads = []
+    try:
+        with open(html_path, 'rb') as f:
+            html_bytes = f.read()
+    except FileNotFoundError:
+        html_bytes = None
+    
+    if html_bytes is not None:
+        html_key = f"raw_html/{date_path}/{os.path.basename(html_path)}"
+        html_digest = hashlib.sha256(html_bytes).hexdigest()
+        
+        def upload_html():
+            size = _gzip_put(s3, bucket, html_key, html_bytes, 'text/html; charset=utf-8',
+                             metadata={'sha256': html_digest})
+            return f"Uploaded {html_path} -> {html_key} ({size // 1024} KB gzipped)"
+        uploads.append(_evidence_task(s3, bucket, html_digest, html_key, known_hashes, upload_html))
+    
+    try:
+        shot_digest = _file_sha256(screenshot_path)
+    except FileNotFoundError:
+        shot_digest = None
+    
+    if shot_digest is not None:
+        r2_key = f"full_screenshot/{date_path}/{os.path.basename(screenshot_path)}"
+        mime = mimetypes.guess_type(screenshot_path)[0] or 'application/octet-stream'
+        upload = _upload_task(s3, bucket, screenshot_path, r2_key, mime, f"Uploaded {screenshot_path}",
+                              metadata={'sha256': shot_digest})
+        uploads.append(_evidence_task(s3, bucket, shot_digest, r2_key, known_hashes, upload))
+    return uploads
 
 
-def _upload_telemetry(s3, bucket, run_id, date_path):
-    """Upload telemetry files to archive."""
-    for telemetry_file in ["pulse_history.json", "metrics.json"]:
-        if os.path.exists(telemetry_file):
-            archive_name = f"{os.path.splitext(telemetry_file)[0]}_{run_id}.json"
-            r2_key = f"telemetry_history/{date_path}/{archive_name}"
-            s3.upload_file(telemetry_file, bucket, r2_key, ExtraArgs={'ContentType': 'application/json'})
+def _telemetry_uploads(s3, bucket, run_id, date_path):
+    """
+    Upload tasks for the telemetry files: each is uploaded once to its
+    archive key, then copied server-side to its live mirror at bucket root.
+    Files that don't exist (yet) are skipped when the task runs.
+    """
+    uploads = []
+    for telemetry_file, mime, base, ext in _TELEMETRY_PARTS:
+        archive_name = f"{base}_{run_id}{ext}"
+        r2_key = f"telemetry_history/{date_path}/{archive_name}"
+        upload = _gzip_file_task(s3, bucket, telemetry_file, r2_key, mime)
+        
+        def archive_and_mirror(upload=upload, r2_key=r2_key, live_key=telemetry_file, mime=mime):
+            try:
+                upload()
+            except FileNotFoundError:
+                return None
+            _copy_to_mirror(s3, bucket, r2_key, live_key, mime)
+        uploads.append(archive_and_mirror)
+    return uploads
 